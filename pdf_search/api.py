@@ -1,11 +1,14 @@
 """Unified Production API for PDF Search with Adaptive RAG and Research History."""
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import os
+import json
+import asyncio
 from datetime import datetime
 import traceback
 import uvicorn
@@ -198,7 +201,7 @@ def summarize(request: SummarizeRequest):
     global summarizer
     try:
         if summarizer is None:
-            summarizer = DocumentSummarizer()
+            summarizer = DocumentSummarizer.get_instance()
         
         if request.summarize_all:
             summaries = summarizer.summarize_all_documents(max_length=request.length)
@@ -233,6 +236,37 @@ def summarize(request: SummarizeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/summarize/stream")
+def summarize_stream(request: SummarizeRequest):
+    """Stream a single document's summary as plain text while it is generated."""
+    global summarizer
+    if not request.filename:
+        raise HTTPException(status_code=400, detail="Must specify filename")
+    
+    try:
+        if summarizer is None:
+            summarizer = DocumentSummarizer.get_instance()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def stream():
+        parts = []
+        for part in summarizer.summarize_document_stream(request.filename, max_length=request.length):
+            parts.append(part)
+            yield part
+        # Save to history once the full summary has been sent
+        try:
+            memory = MemoryManager()
+            memory.add_interaction(
+                question=f"Summarize {request.filename}",
+                answer="".join(parts),
+                sources=[request.filename]
+            )
+        except Exception as e:
+            print(f"Failed to save summary history: {e}")
+    
+    return StreamingResponse(stream(), media_type="text/plain; charset=utf-8")
+
 @app.get("/api/version")
 def version():
     return {"version": "1.0.2-debug", "timestamp": str(datetime.now())}
@@ -321,6 +355,48 @@ def get_ingestion_status():
     # status_tracker.clear_completed() # Optional: Clear old tasks? Maybe not immediately so UI can see completion.
     return {"success": True, "status": status_tracker.get_status()}
 
+# Seconds between keep-alive comments on the ingestion stream while nothing changes
+INGESTION_STREAM_HEARTBEAT = 15
+# Seconds between checks of the status version while a stream is open
+INGESTION_STREAM_POLL = 0.25
+
+@app.get("/api/ingestion/stream")
+def stream_ingestion_status(filenames: Optional[List[str]] = Query(None)):
+    """Server-sent events carrying the ingestion status, pushed on every change.
+    
+    With `filenames`, the stream ends once all of them are completed or failed.
+    """
+    status_tracker = IngestionStatus.get_instance()
+    
+    # Async, so an open stream waits on the event loop instead of holding
+    # one of the threadpool workers that serve the sync endpoints
+    async def events():
+        version = -1
+        idle = 0.0
+        while True:
+            if status_tracker.version == version:
+                await asyncio.sleep(INGESTION_STREAM_POLL)
+                idle += INGESTION_STREAM_POLL
+                if idle >= INGESTION_STREAM_HEARTBEAT:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+                continue
+            
+            idle = 0.0
+            version, status = status_tracker.snapshot()
+            yield f"data: {json.dumps({'success': True, 'status': status})}\n\n"
+            if filenames and all(
+                status.get(name, {}).get("status") in ("completed", "failed")
+                for name in filenames
+            ):
+                return
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 def process_upload_background(file_paths: List[Path]):
     # Lazy load inside background task
     search_engine = SemanticSearchEngine.get_instance()
@@ -387,6 +463,12 @@ async def rename_history_item(interaction_id: str, request: RenameRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.on_event("shutdown")
+def flush_search_engine():
+    # Only flush if the engine was ever created in this process
+    if SemanticSearchEngine._instance is not None:
+        SemanticSearchEngine._instance.flush()
+
 if os.path.exists("frontend/dist"):
     app.mount("/", StaticFiles(directory="frontend/dist", html=True), name="frontend")
 
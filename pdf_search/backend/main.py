@@ -142,7 +142,7 @@ def summarize(request: SummarizeRequest):
     
     try:
         if summarizer is None:
-            summarizer = DocumentSummarizer()
+            summarizer = DocumentSummarizer.get_instance()
         
         if request.summarize_all:
             summaries = summarizer.summarize_all_documents(max_length=request.length)
@@ -200,7 +200,7 @@ def list_documents():
     
     try:
         if summarizer is None:
-            summarizer = DocumentSummarizer()
+            summarizer = DocumentSummarizer.get_instance()
         
         documents = summarizer.get_available_documents()
         index_info = summarizer.search_engine.get_index_info()
@@ -35,11 +35,12 @@ def benchmark_local_store_updates():
     
     engine = SemanticSearchEngine.get_instance()
     engine.index_file = MockConfig.INDEX_DIR / "document_index.json"
-    engine.chunk_store_file = MockConfig.INDEX_DIR / "chunk_store.json"
     
     # Reset files
     if engine.index_file.exists(): engine.index_file.unlink()
-    if engine.chunk_store_file.exists(): engine.chunk_store_file.unlink()
+    chunk_db_file = MockConfig.INDEX_DIR / "chunk_store.db"
+    if chunk_db_file.exists(): chunk_db_file.unlink()
+    engine._open_chunk_store(chunk_db_file)
     
     # Mock Embedder and EndeeClient to isolate JSON logic
     engine.embedder = MagicMock()
@@ -65,7 +66,7 @@ def benchmark_local_store_updates():
                 page_num=1,
                 chunk_id=chunk_id,
                 source_file="benchmark_doc.pdf",
-                metadata={"file_path": "benchmark_doc.pdf"}
+                file_path="benchmark_doc.pdf"
             ))
         all_chunks.extend(chunks)
 
@@ -20,7 +20,8 @@ def cli():
 
 @cli.command()
 @click.option('--pdf-dir', type=click.Path(exists=True), help='Directory containing PDFs')
-def ingest(pdf_dir):
+@click.option('--workers', default=1, help='Number of processes used to parse PDFs')
+def ingest(pdf_dir, workers):
     """Ingest PDFs into the search engine."""
     engine = SemanticSearchEngine()
     
@@ -36,7 +37,7 @@ def ingest(pdf_dir):
         console.print(f"[red]Directory not found: {pdf_path}[/red]")
         return
     
-    success = engine.ingest_pdfs(pdf_path)
+    success = engine.ingest_pdfs(pdf_path, workers=workers)
     
     if success:
         console.print("\n[green]✓ Ingestion completed successfully![/green]")
@@ -265,7 +266,7 @@ def summarize(file, length, summarize_all):
     """Summarize documents from the vector database."""
     from summarizer import DocumentSummarizer
     
-    summarizer = DocumentSummarizer()
+    summarizer = DocumentSummarizer.get_instance()
     
     if summarize_all:
         # Summarize all documents
@@ -309,7 +310,7 @@ def list_documents():
     """List all documents available in the vector database."""
     from summarizer import DocumentSummarizer
     
-    summarizer = DocumentSummarizer()
+    summarizer = DocumentSummarizer.get_instance()
     documents = summarizer.get_available_documents()
     
     if not documents:
@@ -1,9 +1,13 @@
 """Text embedding generation using fastembed (lightweight)."""
 import numpy as np
+from functools import lru_cache
 from typing import List, Union
 from fastembed import TextEmbedding
 from config import Config
 
+# Distinct query texts whose embeddings embed_text keeps in memory
+EMBED_TEXT_CACHE_SIZE = 4096
+
 
 class Embedder:
     """Generate embeddings for text using fastembed (ONNX Runtime)."""
@@ -30,12 +34,20 @@ class Embedder:
             cache_dir=str(self.cache_dir)
         )
         print(f"Model loaded.")
+        
+        # Per-instance memo for repeated queries
+        self._embed_text_cached = lru_cache(maxsize=EMBED_TEXT_CACHE_SIZE)(self._embed_text)
     
     def embed_text(self, text: str) -> np.ndarray:
-        """Generate embedding for a single text."""
+        """Generate embedding for a single text (memoized; treat as read-only)."""
+        return self._embed_text_cached(text)
+    
+    def _embed_text(self, text: str) -> np.ndarray:
         # FastEmbed returns a generator of embeddings
-        embeddings = list(self.model.embed([text]))
-        return embeddings[0]
+        embedding = np.array(next(iter(self.model.embed([text]))), dtype=np.float32)
+        # The same array is returned for every cache hit
+        embedding.setflags(write=False)
+        return embedding
     
     def embed_batch(
         self,
@@ -43,10 +55,17 @@ class Embedder:
         batch_size: int = 4, # Reduced from 32 to 4 for Render Free Tier (512MB RAM) safety
         show_progress: bool = True
     ) -> np.ndarray:
-        """Generate embeddings for multiple texts."""
-        # FastEmbed handles batching internally, but we can pass list
-        embeddings = list(self.model.embed(texts, batch_size=batch_size))
-        return np.array(embeddings)
+        """Generate embeddings for multiple texts.
+        
+        Returns:
+            Contiguous float32 array (N x D)
+        """
+        # FastEmbed handles batching internally; rows are copied straight
+        # into one preallocated array instead of a list of arrays
+        embeddings = np.empty((len(texts), self.get_dimension()), dtype=np.float32)
+        for i, embedding in enumerate(self.model.embed(texts, batch_size=batch_size)):
+            embeddings[i] = embedding
+        return embeddings
     
     def get_dimension(self) -> int:
         """Get embedding dimension."""
@@ -0,0 +1,174 @@
+"""Persistent content-hash cache for chunk embeddings."""
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within this process are serialized
+    fcntl = None
+
+
+class EmbeddingCache:
+    """Cache of text embeddings keyed by a hash of (model, text).
+
+    Vectors are stored as float16 rows appended to a flat file that is read
+    through a memory map; row keys are appended to a sidecar file, one per
+    line, so the cache never rewrites existing data.
+
+    Appends happen under a thread lock plus an exclusive lock on
+    emb_cache.lock, after indexing any rows other writers appended, so the
+    Nth key line always names the Nth vector row.
+    """
+
+    def __init__(self, directory: Path, dimension: int, model_name: str):
+        """Open (or create) the cache.
+
+        Args:
+            directory: Directory holding the cache files
+            dimension: Embedding dimension
+            model_name: Embedding model name (part of every key)
+        """
+        self.dimension = dimension
+        self.model_name = model_name
+        self.vectors_file = directory / "emb_cache.f16"
+        self.keys_file = directory / "emb_cache.keys"
+        self.lock_file = directory / "emb_cache.lock"
+
+        self._rows: Dict[str, int] = {}
+        # Rows in the files (and bytes of keys_file) indexed so far
+        self._row_count = 0
+        self._keys_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        with self._locked():
+            self._load()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the in-process lock and, where supported, the cross-process file lock."""
+        with self._lock, open(self.lock_file, 'ab') as lock:
+            if fcntl is not None:
+                # Released when the lock file is closed
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _load(self):
+        """Load the key index, dropping rows left incomplete by a crash."""
+        keys = []
+        if self.keys_file.exists():
+            with open(self.keys_file, 'rb') as f:
+                # A crash can leave a final line without its newline
+                keys = f.read().split(b"\n")[:-1]
+
+        row_bytes = self.dimension * np.dtype(np.float16).itemsize
+        vector_bytes = self.vectors_file.stat().st_size if self.vectors_file.exists() else 0
+        rows = min(len(keys), vector_bytes // row_bytes)
+        keys = keys[:rows]
+        keys_data = b"".join(key + b"\n" for key in keys)
+
+        # Keep both files aligned so later appends map key N to row N
+        if vector_bytes != rows * row_bytes:
+            with open(self.vectors_file, 'r+b') as f:
+                f.truncate(rows * row_bytes)
+        if not self.keys_file.exists() or self.keys_file.stat().st_size != len(keys_data):
+            with open(self.keys_file, 'wb') as f:
+                f.write(keys_data)
+
+        self._rows = {key.decode("ascii"): row for row, key in enumerate(keys)}
+        self._row_count = rows
+        self._keys_offset = len(keys_data)
+
+    def _refresh(self):
+        """Index rows appended by other writers since the last load/append (call under _locked)."""
+        with open(self.keys_file, 'rb') as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # Only complete lines; a failed write can leave a partial one
+        data = data[:data.rfind(b"\n") + 1]
+        for key in data.splitlines():
+            self._rows.setdefault(key.decode("ascii"), self._row_count)
+            self._row_count += 1
+        self._keys_offset += len(data)
+
+    def key(self, text: str) -> str:
+        """Cache key for a text under the current model."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _vectors(self) -> np.memmap:
+        """Memory map covering every indexed row (remapped after appends)."""
+        if self._mmap is None or len(self._mmap) < self._row_count:
+            self._mmap = np.memmap(
+                self.vectors_file,
+                dtype=np.float16,
+                mode='r',
+                shape=(self._row_count, self.dimension)
+            )
+        return self._mmap
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up embeddings.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            float32 vector per key, or None for misses
+        """
+        with self._lock:
+            if not self._row_count:
+                return [None] * len(keys)
+
+            vectors = self._vectors()
+            results = []
+            for key in keys:
+                row = self._rows.get(key)
+                results.append(None if row is None else np.array(vectors[row], dtype=np.float32))
+            return results
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Store embeddings for keys not already cached.
+
+        Args:
+            keys: Cache keys
+            vectors: Array of vectors (N x D), aligned with keys
+        """
+        new_vectors = {}
+        for key, vector in zip(keys, vectors):
+            if key not in self._rows:
+                new_vectors.setdefault(key, vector)
+
+        if not new_vectors:
+            return
+
+        with self._locked():
+            # Another writer may have appended rows (possibly these keys)
+            self._refresh()
+            new_keys = [key for key in new_vectors if key not in self._rows]
+            if not new_keys:
+                return
+
+            keys_data = "".join(key + "\n" for key in new_keys).encode("ascii")
+            row_bytes = self.dimension * np.dtype(np.float16).itemsize
+            # Vectors first: a key line never names a row that is not on disk.
+            # Both files are cut back to the indexed rows before appending, so
+            # rows left without keys by a failed write can't shift later keys.
+            with open(self.vectors_file, 'ab') as f:
+                f.truncate(self._row_count * row_bytes)
+                f.write(np.asarray([new_vectors[key] for key in new_keys], dtype=np.float16).tobytes())
+            with open(self.keys_file, 'ab') as f:
+                f.truncate(self._keys_offset)
+                f.write(keys_data)
+
+            for key in new_keys:
+                self._rows[key] = self._row_count
+                self._row_count += 1
+            self._keys_offset += len(keys_data)
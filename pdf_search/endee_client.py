@@ -1,10 +1,14 @@
 """Endee vector database client for semantic search."""
 import requests
+from requests.adapters import HTTPAdapter
 import numpy as np
 import msgpack
 from typing import List, Dict, Any, Optional
 from config import Config
 
+# Keep-alive connections per host; covers concurrent inserts and batch searches
+HTTP_POOL_SIZE = 8
+
 
 class EndeeClient:
     """Client for interacting with Endee vector database."""
@@ -18,6 +22,13 @@ class EndeeClient:
         self.base_url = base_url or Config.ENDEE_URL
         self.index_name = Config.COLLECTION_NAME
         
+        # Reuse connections across requests instead of reconnecting
+        # (TCP + TLS handshake) for every insert batch and search
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
     def create_collection(self, dimension: int = None) -> bool:
         """Create a new index in Endee.
         
@@ -31,7 +42,7 @@ class EndeeClient:
         
         try:
             # Server uses /api/v1/index/create
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/v1/index/create",
                 json={
                     "index_name": self.index_name,
@@ -75,6 +86,8 @@ class EndeeClient:
         
         try:
             # Server expects a list of objects at /api/v1/index/{name}/vector/insert
+            # Convert the whole array once, at the serialization boundary
+            vector_lists = np.asarray(vectors, dtype=np.float32).tolist()
             data = []
             for i in range(len(vectors)):
                 # We need a unique ID for each vector. Chunk IDs are available in metadata.
@@ -88,12 +101,12 @@ class EndeeClient:
                 
                 data.append({
                     "id": str(vec_id),
-                    "vector": vectors[i].tolist(),
+                    "vector": vector_lists[i],
                     "metadata": metadata[i]
                 })
             
             # Using JSON for insertion as it's easier to debug than binary msgpack for now
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/v1/index/{self.index_name}/vector/insert",
                 json=data,
                 headers={"Content-Type": "application/json"},
@@ -152,7 +165,7 @@ class EndeeClient:
                 data["filter"] = filters
             
             print(f"DEBUG: Searching index '{self.index_name}' at {self.base_url}")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/v1/index/{self.index_name}/search",
                 json=data,
                 timeout=120 # Increased timeout
@@ -223,7 +236,7 @@ class EndeeClient:
         """
         try:
             # Server endpoint: DELETE /api/v1/index/{name}/delete
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}/api/v1/index/{self.index_name}/delete"
             )
             
@@ -241,7 +254,7 @@ class EndeeClient:
         """
         try:
             # Server endpoint: GET /api/v1/index/list
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/v1/index/list"
             )
             
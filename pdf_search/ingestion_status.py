@@ -1,4 +1,5 @@
 
+import threading
 from typing import Dict, Any
 from datetime import datetime
 
@@ -12,6 +13,9 @@ class IngestionStatus:
         #                       message: str,
         #                       updated_at: datetime } }
         self.status: Dict[str, Dict[str, Any]] = {}
+        # Bumped on every update, so watchers can cheaply poll for changes
+        self.version = 0
+        self._lock = threading.Lock()
     
     @classmethod
     def get_instance(cls):
@@ -21,20 +25,32 @@ class IngestionStatus:
 
     def update_status(self, filename: str, status: str, message: str = None, progress: int = 0, total: int = 0):
         print(f"[IngestionStatus] Updating {filename}: status={status}, progress={progress}/{total}, msg={message}")
-        if filename not in self.status:
-            self.status[filename] = {}
+        with self._lock:
+            if filename not in self.status:
+                self.status[filename] = {}
+                
+            self.status[filename].update({
+                "status": status,
+                "updated_at": datetime.now().isoformat()
+            })
             
-        self.status[filename].update({
-            "status": status,
-            "updated_at": datetime.now().isoformat()
-        })
+            if message:
+                self.status[filename]["message"] = message
+            if progress > 0:
+                self.status[filename]["progress"] = progress
+            if total > 0:
+                self.status[filename]["total"] = total
+            
+            self.version += 1
+    
+    def snapshot(self):
+        """Copy of all statuses, taken consistently with the version.
         
-        if message:
-            self.status[filename]["message"] = message
-        if progress > 0:
-            self.status[filename]["progress"] = progress
-        if total > 0:
-            self.status[filename]["total"] = total
+        Returns:
+            (current version, snapshot of all statuses)
+        """
+        with self._lock:
+            return self.version, {name: dict(info) for name, info in self.status.items()}
             
     def get_status(self, filename: str = None):
         if filename:
@@ -43,6 +59,8 @@ class IngestionStatus:
     
     def clear_completed(self):
         """Remove completed tasks to keep memory clean"""
-        to_remove = [k for k, v in self.status.items() if v['status'] in ['completed', 'failed']]
-        for k in to_remove:
-            del self.status[k]
+        with self._lock:
+            to_remove = [k for k, v in self.status.items() if v['status'] in ['completed', 'failed']]
+            for k in to_remove:
+                del self.status[k]
+            self.version += 1
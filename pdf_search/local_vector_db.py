@@ -37,7 +37,7 @@ class LocalVectorDB:
     def insert_vectors(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]) -> bool:
         """Insert vectors into the collection."""
         points = []
-        for i, vec in enumerate(vectors):
+        for i, vec in enumerate(np.asarray(vectors, dtype=np.float32).tolist()):
             # Use chunk_id or index as ID
             import uuid
             point_id = str(uuid.uuid4())
@@ -47,7 +47,7 @@ class LocalVectorDB:
             
             points.append(PointStruct(
                 id=point_id,
-                vector=vec.tolist(),
+                vector=vec,
                 payload=meta
             ))
         
@@ -12,7 +12,19 @@ class MemoryManager:
         from config import Config
         self.memory_file = Config.DATA_DIR / memory_file
         print(f"[MemoryManager] Using memory file: {self.memory_file}")
-        self.memory = self._load_memory()
+        # Loaded on first access so constructing a manager stays cheap
+        # regardless of how large the history file has grown
+        self._memory = None
+        self._topics_set = None
+    
+    @property
+    def memory(self) -> Dict[str, Any]:
+        """Memory contents, loaded from disk on first access."""
+        if self._memory is None:
+            self._memory = self._load_memory()
+            # Persistent membership index for topics_explored (kept in sync on every update)
+            self._topics_set = set(self._memory.setdefault("topics_explored", []))
+        return self._memory
         
     def _load_memory(self) -> Dict[str, Any]:
         """Load memory from file and migrate if needed."""
@@ -79,9 +91,9 @@ class MemoryManager:
         except Exception as e:
             print(f"Error saving memory: {e}")
             
-    def add_interaction(self, question: str, answer: str, topics: List[str] = None, sources: List[str] = None):
-        """Add an interaction to memory."""
-        interaction = {
+    def _new_interaction(self, question: str, answer: str, topics: List[str] = None, sources: List[str] = None) -> Dict[str, Any]:
+        """Build an interaction record."""
+        return {
             "id": str(uuid.uuid4()),
             "timestamp": datetime.now().isoformat(),
             "question": question,
@@ -90,15 +102,46 @@ class MemoryManager:
             "topics": topics or [],
             "sources": sources or []
         }
+    
+    def _add_topics(self, topics):
+        """Append topics not yet explored, keeping first-seen order."""
+        for topic in topics:
+            if topic not in self._topics_set:
+                self._topics_set.add(topic)
+                self.memory["topics_explored"].append(topic)
+    
+    def add_interaction(self, question: str, answer: str, topics: List[str] = None, sources: List[str] = None):
+        """Add an interaction to memory."""
+        interaction = self._new_interaction(question, answer, topics, sources)
         self.memory["interactions"].append(interaction)
         
         # Update topics
         if topics:
-            existing_topics = set(self.memory["topics_explored"])
-            for topic in topics:
-                if topic not in existing_topics:
-                    self.memory["topics_explored"].append(topic)
+            self._add_topics(topics)
+        
+        self.save_memory()
+    
+    def add_interactions_batch(self, records: List[Dict[str, Any]]):
+        """Add many interactions with a single topic update and file write.
+        
+        Args:
+            records: Dicts with 'question', 'answer' and optional 'topics'/'sources'
+        """
+        if not records:
+            return
+        
+        interactions = self.memory["interactions"]
+        new_topics = {}
+        for record in records:
+            interactions.append(self._new_interaction(
+                record["question"],
+                record["answer"],
+                record.get("topics"),
+                record.get("sources")
+            ))
+            new_topics.update(dict.fromkeys(record.get("topics") or []))
         
+        self._add_topics(new_topics)
         self.save_memory()
         
     def delete_interaction(self, interaction_id: str) -> bool:
@@ -126,27 +169,33 @@ class MemoryManager:
         """Clear all interactions and research context."""
         self.memory["interactions"] = []
         self.memory["topics_explored"] = []
+        self._topics_set.clear()
         self.memory["verified_facts"] = []
         self.save_memory()
 
     def get_context(self, limit: int = 5) -> str:
         """Get recent context formatted for LLM."""
-        recent_interactions = self.memory["interactions"][-limit:]
-        if not recent_interactions:
+        interactions = self.memory["interactions"]
+        if not interactions or limit <= 0:
             return "No previous research context."
         
-        context = "User's Research History:\n"
+        parts = ["User's Research History:\n"]
         
         # Topics
         topics = self.memory["topics_explored"]
         if topics:
-            context += f"Explore Topics: {', '.join(topics[-10:])}\n"
+            parts.append(f"Explore Topics: {', '.join(topics[-10:])}\n")
             
         # Recent Q&A
-        context += "\nRecent Interactions:\n"
-        for i, interaction in enumerate(recent_interactions, 1):
-             # Handle missing topics key just in case
-            topics_list = interaction.get("topics", [])
-            context += f"{i}. Q: {interaction['question']}\n   Topics: {', '.join(topics_list)}\n"
+        parts.append("\nRecent Interactions:\n")
+        start = max(0, len(interactions) - limit)
+        for i, idx in enumerate(range(start, len(interactions)), 1):
+            interaction = interactions[idx]
+            # Handle missing topics key just in case
+            topics_list = interaction.get("topics")
+            if topics_list:
+                parts.append(f"{i}. Q: {interaction['question']}\n   Topics: {', '.join(topics_list)}\n")
+            else:
+                parts.append(f"{i}. Q: {interaction['question']}\n")
             
-        return context
+        return "".join(parts)
@@ -1,19 +1,107 @@
 """PDF processing and text extraction."""
 import fitz  # PyMuPDF
+import multiprocessing
+import queue
+import sys
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator
+from dataclasses import dataclass, field
 from config import Config
 
+# get_text("text")'s default flags, plus joining words hyphenated across lines
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE
 
-@dataclass
+_END_OF_ITEMS = object()
+
+
+class _ProducerError:
+    """Carries an exception from a prefetch worker to the consumer."""
+    __slots__ = ("exc",)
+    
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def prefetch(iterable: Iterable, maxsize: int, name: str = "prefetch") -> Iterator:
+    """Yield items of iterable, produced ahead on a background thread.
+    
+    At most maxsize items are buffered. Exceptions raised by the producer are
+    re-raised in the consumer, and closing the generator stops the worker.
+    
+    Args:
+        iterable: Source of items (consumed on the worker thread)
+        maxsize: Maximum number of buffered items
+        name: Worker thread name
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        # Timed puts so the worker notices when the consumer has gone away
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(_ProducerError(e))
+        finally:
+            put(_END_OF_ITEMS)
+    
+    worker = threading.Thread(target=produce, name=name, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END_OF_ITEMS:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def _process_pdf_worker(pdf_path: Path, chunk_size: int, chunk_overlap: int) -> List["TextChunk"]:
+    """Chunk a single PDF in a worker process, with its own PDFProcessor."""
+    return PDFProcessor(chunk_size, chunk_overlap).process_pdf(pdf_path)
+
+
+@dataclass(slots=True)
 class TextChunk:
     """Represents a chunk of text from a PDF."""
     text: str
     page_num: int
     chunk_id: int
     source_file: str
-    metadata: Dict[str, Any]
+    file_path: str = ""
+    # Globally unique id ("<file>_<chunk_id>"), set once at construction
+    uid: str = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.uid = self.source_file + "_" + str(self.chunk_id)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Chunk metadata, derived from the fields on demand."""
+        return {
+            "file_path": self.file_path,
+            "file_name": self.source_file,
+            "page": self.page_num,
+            "chunk_id": self.chunk_id
+        }
 
 
 class PDFProcessor:
@@ -33,6 +121,18 @@ class PDFProcessor:
         self.chunk_size = chunk_size or Config.CHUNK_SIZE
         self.chunk_overlap = chunk_overlap or Config.CHUNK_OVERLAP
     
+    def _iter_page_text(self, doc: fitz.Document):
+        """Yield (page_num, text) for each page of an open document.
+        
+        Pages are loaded one at a time and released right after extraction,
+        so parsed page objects are never retained for the whole document.
+        """
+        for page_index in range(doc.page_count):
+            page = doc.load_page(page_index)
+            text = page.get_text("text", flags=TEXT_FLAGS)
+            del page
+            yield page_index + 1, text
+    
     def extract_text_from_pdf(self, pdf_path: Path) -> str:
         """Extract all text from a PDF file.
         
@@ -43,14 +143,8 @@ class PDFProcessor:
             Extracted text
         """
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            
-            for page in doc:
-                text += page.get_text()
-            
-            doc.close()
-            return text
+            with fitz.open(pdf_path) as doc:
+                return "".join(text for _, text in self._iter_page_text(doc))
             
         except Exception as e:
             print(f"Error extracting text from {pdf_path}: {e}")
@@ -66,18 +160,16 @@ class PDFProcessor:
             List of dicts with page number and text
         """
         try:
-            doc = fitz.open(pdf_path)
             pages = []
             
-            for page_num, page in enumerate(doc, start=1):
-                text = page.get_text()
-                if text.strip():  # Only include non-empty pages
-                    pages.append({
-                        "page_num": page_num,
-                        "text": text
-                    })
+            with fitz.open(pdf_path) as doc:
+                for page_num, text in self._iter_page_text(doc):
+                    if text.strip():  # Only include non-empty pages
+                        pages.append({
+                            "page_num": page_num,
+                            "text": text
+                        })
             
-            doc.close()
             return pages
             
         except Exception as e:
@@ -102,18 +194,18 @@ class PDFProcessor:
         
         while start < text_length:
             end = start + self.chunk_size
-            chunk = text[start:end]
             
-            # Try to break at sentence boundary
+            # Try to break at sentence boundary. Delimiters are searched in
+            # the page text directly so each chunk is sliced out only once.
             if end < text_length:
                 # Look for sentence endings
                 for delimiter in ['. ', '.\n', '! ', '?\n', '? ']:
-                    last_delim = chunk.rfind(delimiter)
-                    if last_delim > self.chunk_size * 0.5:  # At least 50% through
-                        chunk = chunk[:last_delim + 1]
+                    last_delim = text.rfind(delimiter, start, end)
+                    if last_delim - start > self.chunk_size * 0.5:  # At least 50% through
+                        end = last_delim + 1
                         break
             
-            chunks.append(chunk.strip())
+            chunks.append(text[start:end].strip())
             start += self.chunk_size - self.chunk_overlap
         
         return chunks
@@ -127,55 +219,27 @@ class PDFProcessor:
         Returns:
             List of TextChunk objects
         """
-        chunks = []
-        pages = self.extract_text_by_page(pdf_path)
-        
-        chunk_counter = 0
-        
-        for page_data in pages:
-            page_num = page_data["page_num"]
-            page_text = page_data["text"]
-            
-            # Chunk the page text
-            page_chunks = self.chunk_text(page_text)
-            
-            for chunk_text in page_chunks:
-                if chunk_text.strip():  # Skip empty chunks
-                    chunk = TextChunk(
-                        text=chunk_text,
-                        page_num=page_num,
-                        chunk_id=chunk_counter,
-                        source_file=pdf_path.name,
-                        metadata={
-                            "file_path": str(pdf_path),
-                            "file_name": pdf_path.name,
-                            "page": page_num,
-                            "chunk_id": chunk_counter
-                        }
-                    )
-                    chunks.append(chunk)
-                    chunk_counter += 1
-        
-        return chunks
+        return list(self.process_pdf_generator(pdf_path))
     
     def yield_text_by_page(self, pdf_path: Path):
         """Yield text from PDF page by page (generator)."""
         try:
-            doc = fitz.open(pdf_path)
-            for page_num, page in enumerate(doc, start=1):
-                text = page.get_text()
-                if text.strip():
-                    yield {
-                        "page_num": page_num,
-                        "text": text
-                    }
-            doc.close()
+            with fitz.open(pdf_path) as doc:
+                for page_num, text in self._iter_page_text(doc):
+                    if text.strip():
+                        yield {
+                            "page_num": page_num,
+                            "text": text
+                        }
         except Exception as e:
             print(f"Error extracting pages from {pdf_path}: {e}")
 
     def process_pdf_generator(self, pdf_path: Path):
         """Yield chunks from a PDF (generator)."""
         chunk_counter = 0
+        # Shared by every chunk of this PDF
+        source_file = sys.intern(pdf_path.name)
+        file_path = sys.intern(str(pdf_path))
         for page_data in self.yield_text_by_page(pdf_path):
             page_num = page_data["page_num"]
             page_text = page_data["text"]
@@ -183,18 +247,13 @@ class PDFProcessor:
             page_chunks = self.chunk_text(page_text)
             
             for chunk_text in page_chunks:
-                if chunk_text.strip():
+                if chunk_text:  # chunk_text already strips each chunk
                     yield TextChunk(
                         text=chunk_text,
                         page_num=page_num,
                         chunk_id=chunk_counter,
-                        source_file=pdf_path.name,
-                        metadata={
-                            "file_path": str(pdf_path),
-                            "file_name": pdf_path.name,
-                            "page": page_num,
-                            "chunk_id": chunk_counter
-                        }
+                        source_file=source_file,
+                        file_path=file_path
                     )
                     chunk_counter += 1
 
@@ -212,3 +271,35 @@ class PDFProcessor:
         for pdf_path in pdf_files:
             print(f"Processing: {pdf_path.name}")
             yield from self.process_pdf_generator(pdf_path)
+
+    def process_directory_parallel(self, directory: Path = None, workers: int = 2):
+        """Yield chunks from all PDFs in a directory, parsing files in worker processes.
+        
+        Up to `workers` files are parsed ahead of the consumer; chunks are
+        still yielded in file order.
+        """
+        directory = directory or Config.PDF_DIR
+        pdf_files = list(directory.glob("*.pdf"))
+        
+        if not pdf_files:
+            print(f"No PDF files found in {directory}")
+            return
+        
+        print(f"Found {len(pdf_files)} PDF files (parsing with {workers} workers)")
+        
+        remaining = iter(pdf_files)
+        # Spawned, not forked: the parent may hold locks in its threads
+        # (prefetch workers, HTTP pools) that a forked child would inherit
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            def submit(pdf_path):
+                return pdf_path, pool.submit(_process_pdf_worker, pdf_path, self.chunk_size, self.chunk_overlap)
+            
+            pending = deque(submit(pdf_path) for _, pdf_path in zip(range(workers), remaining))
+            while pending:
+                pdf_path, future = pending.popleft()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(submit(next_path))
+                
+                print(f"Processing: {pdf_path.name}")
+                yield from future.result()
@@ -1,16 +1,43 @@
 """RAG Agent using LangGraph for conversational Q&A over PDF documents."""
-from typing import TypedDict, List, Dict, Any
-from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from typing import TypedDict, List, Dict, Any, Iterator, Tuple
+from collections import OrderedDict
+from functools import cache, cached_property
 import os
+import time
 from dotenv import load_dotenv
 
 from search_engine import SemanticSearchEngine
 
-# Load environment variables
-load_dotenv()
+_TEMPLATE_STR = """You are a helpful AI assistant that answers questions based on PDF documents.
+
+Use the following context from the documents to answer the question. If the answer cannot be found in the context, say so.
+
+Context:
+{context}
+
+Question: {question}
+
+Instructions:
+1. Answer the question using ONLY the information from the context above
+2. Be specific and cite which source you're using when relevant
+3. If the context doesn't contain enough information, acknowledge this
+4. Keep your answer clear and concise
+
+Answer:"""
+
+_RETRIEVAL_TOP_K = 5
+
+# Number of recent question results kept by RAGAgent.ask
+_QA_CACHE_SIZE = 64
+_QA_CACHE_TTL = 3600  # seconds
+
+_NO_CONTEXT_ANSWER = "I couldn't find any relevant information in the documents to answer your question."
+
+
+@cache
+def _load_env() -> None:
+    """Load environment variables from .env (once per process)."""
+    load_dotenv()
 
 
 class RAGState(TypedDict):
@@ -29,8 +56,21 @@ class RAGAgent:
         """Initialize the RAG agent."""
         self.search_engine = SemanticSearchEngine.get_instance()
         
-        # Initialize LLM with OpenRouter
-        self.llm = ChatOpenAI(
+        # The LLM, prompt chain and graph are built on first use (see the
+        # cached properties below) so callers that never ask() skip them.
+        
+        # Bounded LRU of (normalized question, top_k) -> (expiry time, ask() result),
+        # dropped whenever the document index changes on disk
+        self._qa_cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._qa_cache_index_mtime = None
+    
+    @cached_property
+    def llm(self):
+        """LLM client (OpenRouter), created on first use."""
+        from langchain_openai import ChatOpenAI
+        
+        _load_env()
+        return ChatOpenAI(
             model=os.getenv("LLM_MODEL", "openai/gpt-4o-mini"),
             openai_api_key=os.getenv("OPENROUTER_API_KEY"),
             openai_api_base=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
@@ -39,16 +79,35 @@ class RAGAgent:
                 "X-Title": "PDF Search RAG"
             }
         )
+    
+    @cached_property
+    def _prompt(self):
+        """Answer prompt, compiled once."""
+        from langchain_core.prompts import ChatPromptTemplate
         
-        # Build the graph
-        self.graph = self._build_graph()
+        return ChatPromptTemplate.from_template(_TEMPLATE_STR)
     
-    def _retrieval_node(self, state: RAGState) -> RAGState:
-        """Retrieve relevant documents based on the question."""
+    @cached_property
+    def _chain(self):
+        """Prompt | LLM | parser pipeline, composed once and reused per question."""
+        from langchain_core.output_parsers import StrOutputParser
+        
+        return self._prompt | self.llm | StrOutputParser()
+    
+    @cached_property
+    def graph(self):
+        """Compiled LangGraph workflow."""
+        return self._build_graph()
+    
+    def _retrieval_node(self, state: RAGState) -> Dict[str, Any]:
+        """Retrieve relevant documents based on the question.
+        
+        Only the updated keys are returned; LangGraph merges them into the state.
+        """
         question = state["question"]
         
         # Search for relevant chunks
-        results = self.search_engine.search(question, top_k=5)
+        results = self.search_engine.search(question, top_k=_RETRIEVAL_TOP_K)
         
         # Extract documents and sources
         retrieved_docs = []
@@ -77,52 +136,28 @@ class RAGAgent:
         context = "\n".join(context_parts)
         
         return {
-            **state,
             "retrieved_docs": retrieved_docs,
             "context": context,
             "sources": sources
         }
     
-    def _generation_node(self, state: RAGState) -> RAGState:
+    def _generation_node(self, state: RAGState) -> Dict[str, Any]:
         """Generate answer using retrieved context."""
         question = state["question"]
         context = state["context"]
         
         if not context:
-            return {
-                **state,
-                "answer": "I couldn't find any relevant information in the documents to answer your question."
-            }
-        
-        # Create prompt
-        prompt = ChatPromptTemplate.from_template("""You are a helpful AI assistant that answers questions based on PDF documents.
-
-Use the following context from the documents to answer the question. If the answer cannot be found in the context, say so.
-
-Context:
-{context}
-
-Question: {question}
-
-Instructions:
-1. Answer the question using ONLY the information from the context above
-2. Be specific and cite which source you're using when relevant
-3. If the context doesn't contain enough information, acknowledge this
-4. Keep your answer clear and concise
-
-Answer:""")
+            return {"answer": _NO_CONTEXT_ANSWER}
         
         # Generate answer
-        chain = prompt | self.llm | StrOutputParser()
-        answer = chain.invoke({"context": context, "question": question})
+        answer = self._chain.invoke({"context": context, "question": question})
         
-        return {
-            **state,
-            "answer": answer
-        }
+        return {"answer": answer}
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self):
         """Build the LangGraph workflow."""
+        from langgraph.graph import StateGraph, END
+        
         workflow = StateGraph(RAGState)
         
         # Add nodes
@@ -145,6 +180,25 @@ Answer:""")
         Returns:
             Dict with 'answer', 'sources', and 'retrieved_docs'
         """
+        # Ingests and deletions rewrite the index file; cached answers may cite
+        # removed documents or miss new ones
+        try:
+            index_mtime = self.search_engine.index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            index_mtime = None
+        if index_mtime != self._qa_cache_index_mtime:
+            self._qa_cache.clear()
+            self._qa_cache_index_mtime = index_mtime
+        
+        key = (question.strip().lower(), _RETRIEVAL_TOP_K)
+        entry = self._qa_cache.get(key)
+        if entry is not None:
+            expires_at, cached = entry
+            if time.time() < expires_at:
+                self._qa_cache.move_to_end(key)
+                return dict(cached)
+            del self._qa_cache[key]
+        
         # Initialize state
         initial_state = {
             "question": question,
@@ -157,11 +211,40 @@ Answer:""")
         # Run the graph
         result = self.graph.invoke(initial_state)
         
-        return {
+        response = {
             "answer": result["answer"],
             "sources": result["sources"],
             "retrieved_docs": result["retrieved_docs"]
         }
+        
+        # Only answers grounded in retrieved documents are stored; an empty
+        # retrieval may just be a transient vector-DB error
+        if response["retrieved_docs"] and response["answer"] != _NO_CONTEXT_ANSWER:
+            self._qa_cache[key] = (time.time() + _QA_CACHE_TTL, dict(response))
+            if len(self._qa_cache) > _QA_CACHE_SIZE:
+                self._qa_cache.popitem(last=False)
+        
+        return response
+    
+    def ask_stream(self, question: str) -> Iterator[str]:
+        """Ask a question and stream the answer token by token.
+        
+        Retrieval runs as usual; generation bypasses the graph so tokens can
+        be yielded as soon as the LLM produces them.
+        
+        Args:
+            question: The question to ask
+            
+        Yields:
+            Answer text fragments
+        """
+        state = self._retrieval_node({"question": question})
+        
+        if not state["context"]:
+            yield _NO_CONTEXT_ANSWER
+            return
+        
+        yield from self._chain.stream({"context": state["context"], "question": question})
 
 
 # Convenience function for quick usage
@@ -1,13 +1,47 @@
-import json
+import orjson
+import os
+import sqlite3
+import threading
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from tqdm import tqdm
 
 from config import Config
-from pdf_processor import PDFProcessor, TextChunk
+from pdf_processor import PDFProcessor, TextChunk, prefetch
 from embedder import Embedder
+from embedding_cache import EmbeddingCache
 from endee_client import EndeeClient
 
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within this process are serialized
+    fcntl = None
+
+# Chunk batches parsed ahead of the embed/insert loop in ingest_pdfs
+INGEST_PREFETCH_BATCHES = 4
+# Vector-DB inserts left running while the next batch is embedded
+MAX_INFLIGHT_INSERTS = 2
+# Concurrent vector-DB searches issued by search_batch
+SEARCH_BATCH_WORKERS = 4
+
+# Chunk record fields, in chunk_store.db column order (after uid)
+_CHUNK_COLUMNS = ("text", "file_name", "page", "chunk_id", "file_path")
+# Max uids bound into one IN (...) query (SQLite's default variable limit is 999)
+_MAX_SQL_VARIABLES = 900
+# Bytes of chunk_store.db SQLite reads through a memory map instead of read()
+CHUNK_STORE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _json_default(obj):
+    """orjson fallback: page sets are stored as sorted lists."""
+    if isinstance(obj, set):
+        return sorted(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 
 class SemanticSearchEngine:
     """
@@ -15,24 +49,28 @@ class SemanticSearchEngine:
     Handles ingesting, embedding, and searching.
     """
     _instance = None
+    _instance_lock = threading.Lock()
     
     @classmethod
     def get_instance(cls):
-        """Get or create the singleton instance."""
+        """Get or create the singleton instance (thread-safe)."""
         if cls._instance is None:
-            print("Initializing SemanticSearchEngine Singleton...")
-            cls._instance = cls()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    print("Initializing SemanticSearchEngine Singleton...")
+                    cls._instance = cls()
         return cls._instance
 
     def __init__(self):
-        """Initialize the search engine."""
-        # Ensure only initialized once via get_instance if possible, 
-        # but keep __init__ functional for direct usage if needed (though discouraged).
-        pass  # Real init logic follows...
-        
+        """Initialize the search engine (prefer get_instance())."""
         self.config = Config
         self.pdf_processor = PDFProcessor()
         self.embedder = Embedder()
+        # Fixed for the lifetime of the embedder
+        self._dim = self.embedder.get_dimension()
+        self._model_name = self.embedder.model_name
+        # Skips re-embedding identical chunk text (re-ingests, boilerplate)
+        self.embedding_cache = EmbeddingCache(Config.INDEX_DIR, self._dim, self._model_name)
         
         # Select Vector DB based on config
         if Config.VECTOR_DB_TYPE == "qdrant":
@@ -42,9 +80,21 @@ class SemanticSearchEngine:
         else:
             print("Using Remote Endee Vector DB")
             self.endee_client = EndeeClient()
+        
+        # Runs vector inserts so they overlap embedding of the next batch
+        self._insert_pool = ThreadPoolExecutor(max_workers=MAX_INFLIGHT_INSERTS, thread_name_prefix="vector-insert")
             
         self.index_file = Config.INDEX_DIR / "document_index.json"
+        # Older JSON chunk store, imported into SQLite on first open
         self.chunk_store_file = Config.INDEX_DIR / "chunk_store.json"
+        self._open_chunk_store(Config.INDEX_DIR / "chunk_store.db")
+        # document_index.json as last read or written (pages as sets) and its
+        # mtime then; re-read when another process replaces the file
+        self._index_meta: Optional[Dict[str, Any]] = None
+        self._index_meta_mtime: Optional[int] = None
+        # Per-file chunk/page counts recorded since the last flush
+        self._index_pending: Dict[str, Dict[str, Any]] = {}
+        self._index_lock = threading.Lock()
         
     def initialize(self) -> bool:
         """Initialize the search engine (create collection).
@@ -53,14 +103,17 @@ class SemanticSearchEngine:
             True if successful
         """
         print("Initializing Endee collection...")
-        dimension = self.embedder.get_dimension()
-        return self.endee_client.create_collection(dimension=dimension)
+        return self.endee_client.create_collection(dimension=self._dim)
     
-    def ingest_pdfs(self, pdf_source: Optional[Path] = None) -> Tuple[bool, str]:
+    def ingest_pdfs(self, pdf_source: Optional[Path] = None, workers: int = 1) -> Tuple[bool, str]:
         """Ingest documents using streaming and batching to save memory.
         
+        PDF parsing runs on a background thread (and, for directories with
+        workers > 1, in a process pool) so it overlaps embedding and insertion.
+        
         Args:
             pdf_source: Directory containing PDFs or path to a single PDF
+            workers: Number of processes used to parse PDFs in a directory
             
         Returns:
             (Success boolean, Error message string)
@@ -80,11 +133,11 @@ class SemanticSearchEngine:
             if not pdf_source.suffix.lower() == '.pdf':
                 return False, f"File {pdf_source} is not a PDF"
             chunk_generator = self.pdf_processor.process_pdf_generator(pdf_source)
+        elif workers > 1:
+            chunk_generator = self.pdf_processor.process_directory_parallel(pdf_source, workers=workers)
         else:
             chunk_generator = self.pdf_processor.process_directory_generator(pdf_source)
             
-        BATCH_SIZE = 50
-        batch = []
         pending_chunks = [] # For local store batching
         total_ingested = 0
         
@@ -94,37 +147,72 @@ class SemanticSearchEngine:
         current_file = pdf_source.name if pdf_source else "batch_upload"
         status_tracker.update_status(current_file, "processing", message="Starting ingestion...", progress=0)
         
-        print(f"Starting ingestion with batch size {BATCH_SIZE}...")
+        print(f"Starting ingestion with batch size {Config.INGEST_BATCH_SIZE} (max {Config.INGEST_MAX_BYTES} bytes)...")
+        
+        batches = prefetch(
+            self._iter_batches(chunk_generator, Config.INGEST_BATCH_SIZE, Config.INGEST_MAX_BYTES),
+            INGEST_PREFETCH_BATCHES,
+            name="ingest-parse"
+        )
+        
+        inflight = deque()  # (insert future, batch), oldest first
+        
+        def complete_oldest_insert() -> bool:
+            """Wait for the oldest in-flight insert and record its chunks."""
+            nonlocal pending_chunks, total_ingested
+            future, done_batch = inflight.popleft()
+            if not future.result():
+                return False
+            
+            pending_chunks.extend(done_batch)
+            total_ingested += len(done_batch)
+            print(f"Processed batch of {len(done_batch)} chunks (Total: {total_ingested})")
+            status_tracker.update_status(current_file, "processing", message=f"Processed {total_ingested} chunks", progress=total_ingested)
+            
+            # Flush to disk every 1000 chunks
+            if len(pending_chunks) >= 1000:
+                self._flush_updates_to_disk(pending_chunks)
+                pending_chunks = []
+            return True
+        
+        def drain_inserts():
+            """After a failure, wait out the remaining inserts and record the successful ones.
+            
+            Vectors they wrote would otherwise be in the DB with no local chunks.
+            """
+            nonlocal pending_chunks, total_ingested
+            while inflight:
+                future, done_batch = inflight.popleft()
+                try:
+                    inserted = future.result()
+                except Exception as e:
+                    print(f"Error inserting batch: {e}")
+                    inserted = False
+                if inserted:
+                    pending_chunks.extend(done_batch)
+                    total_ingested += len(done_batch)
+            
+            if pending_chunks:
+                self._flush_updates_to_disk(pending_chunks)
+                pending_chunks = []
         
         try:
-            for chunk in chunk_generator:
-                batch.append(chunk)
+            for batch in batches:
+                prepared = self._prepare_batch(batch)
+                # This batch was embedded while earlier inserts ran; wait for
+                # the oldest before queueing another insert
+                if prepared is None or (len(inflight) >= MAX_INFLIGHT_INSERTS and not complete_oldest_insert()):
+                    drain_inserts()
+                    status_tracker.update_status(current_file, "failed", message=f"Batch processing failed after {total_ingested} chunks")
+                    return False, f"Batch processing failed after {total_ingested} chunks (Database Error?)"
                 
-                if len(batch) >= BATCH_SIZE:
-                    if not self._process_batch(batch, save_local=False):
-                        status_tracker.update_status(current_file, "failed", message="Batch processing failed")
-                        return False, "Batch processing failed (Database Error?)"
-                        
-                    pending_chunks.extend(batch)
-                    total_ingested += len(batch)
-                    print(f"Processed batch of {len(batch)} chunks (Total: {total_ingested})")
-                    status_tracker.update_status(current_file, "processing", message=f"Processed {total_ingested} chunks", progress=total_ingested)
-                    batch = [] # Clear memory
-                    
-                    # Flush to disk every 1000 chunks
-                    if len(pending_chunks) >= 1000:
-                        self._flush_updates_to_disk(pending_chunks)
-                        pending_chunks = []
-
-            # Process remaining chunks
-            if batch:
-                if not self._process_batch(batch, save_local=False):
-                    status_tracker.update_status(current_file, "failed", message="Final batch processing failed")
-                    return False, "Final batch processing failed"
-                pending_chunks.extend(batch)
-                total_ingested += len(batch)
-                print(f"Processed final batch of {len(batch)} chunks")
-                status_tracker.update_status(current_file, "processing", message=f"Processed {total_ingested} chunks", progress=total_ingested)
+                inflight.append((self._insert_pool.submit(self.endee_client.insert_vectors, *prepared), batch))
+            
+            while inflight:
+                if not complete_oldest_insert():
+                    drain_inserts()
+                    status_tracker.update_status(current_file, "failed", message=f"Final batch processing failed after {total_ingested} chunks")
+                    return False, f"Final batch processing failed after {total_ingested} chunks"
             
             # Final flush
             if pending_chunks:
@@ -141,44 +229,93 @@ class SemanticSearchEngine:
         except Exception as e:
             import traceback
             traceback.print_exc()
-            status_tracker.update_status(current_file, "failed", message=str(e))
+            drain_inserts()
+            status_tracker.update_status(current_file, "failed", message=f"{e} (after {total_ingested} chunks)")
             return False, f"Ingestion stream failed: {str(e)}"
+        finally:
+            batches.close()
+            # No-op unless an early exit skipped the drain above
+            drain_inserts()
+            # Persist metadata for everything recorded so far, even on failure
+            self._flush_index_metadata()
+    
+    @staticmethod
+    def _iter_batches(chunks, batch_size: int, max_bytes: int):
+        """Group a chunk stream into batches of at most batch_size chunks.
+        
+        A batch is also cut early once its text reaches max_bytes, so long
+        chunks do not produce oversized insert requests.
+        """
+        batch = []
+        batch_bytes = 0
+        for chunk in chunks:
+            batch.append(chunk)
+            batch_bytes += len(chunk.text)
+            if len(batch) >= batch_size or batch_bytes >= max_bytes:
+                yield batch
+                batch = []
+                batch_bytes = 0
+        if batch:
+            yield batch
             
-    def _process_batch(self, chunks: List[TextChunk], save_local: bool = True) -> bool:
-        """Process a single batch of chunks: Embed -> Insert -> Save Local."""
+    def _prepare_batch(self, chunks: List[TextChunk]) -> Optional[Tuple[Any, List[Dict[str, Any]]]]:
+        """Embed a batch of chunks and build its vector metadata.
+        
+        Returns:
+            (embeddings, metadata), or None if embedding failed
+        """
         try:
-            # 1. Generate Embeddings
-            texts = [chunk.text for chunk in chunks]
-            embeddings = self.embedder.embed_batch(texts, show_progress=False)
-            
-            # 2. Prepare Metadata
+            # 1. Collect texts and metadata in one pass
+            texts = []
             metadata = []
             for chunk in chunks:
-                meta = {
+                texts.append(chunk.text)
+                metadata.append({
                     "text": chunk.text,
                     "file_name": chunk.source_file,
                     "page": chunk.page_num,
                     "chunk_id": chunk.chunk_id,
-                    "file_path": chunk.metadata.get("file_path", "")
-                }
-                # Create ID
-                meta['id'] = f"{meta['file_name']}_{meta['chunk_id']}"
-                metadata.append(meta)
+                    "file_path": chunk.file_path,
+                    "id": chunk.uid
+                })
             
-            # 3. Insert into Endee
-            success = self.endee_client.insert_vectors(embeddings, metadata)
-            if not success:
-                return False
-                
-            # 4. Update Local Stores
-            if save_local:
-                self._update_index_metadata(chunks)
-                self._update_chunk_store(chunks)
+            # 2. Generate Embeddings
+            embeddings = self._embed_texts(texts)
             
-            return True
+            return embeddings, metadata
         except Exception as e:
-            print(f"Error processing batch: {e}")
-            return False
+            print(f"Error preparing batch: {e}")
+            return None
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, reusing cached embeddings for previously seen text.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Array of embeddings (N x D), aligned with texts
+        """
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        
+        # Embed each distinct missing text once
+        misses = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                misses.setdefault(keys[i], i)
+        
+        fresh = {}
+        if misses:
+            miss_keys = list(misses)
+            vectors = self.embedder.embed_batch([texts[misses[k]] for k in miss_keys], show_progress=False)
+            self.embedding_cache.put_many(miss_keys, vectors)
+            fresh = dict(zip(miss_keys, vectors))
+        
+        embeddings = np.empty((len(texts), self._dim), dtype=np.float32)
+        for i, vector in enumerate(cached):
+            embeddings[i] = fresh[keys[i]] if vector is None else vector
+        return embeddings
 
     def _flush_updates_to_disk(self, chunks: List[TextChunk]):
         """Flush accumulated chunks to local JSON stores."""
@@ -189,63 +326,190 @@ class SemanticSearchEngine:
         self._update_index_metadata(chunks)
         self._update_chunk_store(chunks)
 
+    def _open_chunk_store(self, db_file: Path):
+        """Open (creating if needed) the SQLite chunk store.
+        
+        Args:
+            db_file: Path of the SQLite database
+        """
+        self.chunk_db_file = db_file
+        # One connection shared by API and ingestion threads, serialized by a lock
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+        self._db.executescript(f"""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA mmap_size={CHUNK_STORE_MMAP_SIZE};
+            CREATE TABLE IF NOT EXISTS chunks (
+                uid TEXT PRIMARY KEY,
+                text TEXT,
+                file_name TEXT,
+                page INTEGER,
+                chunk_id INTEGER,
+                file_path TEXT
+            );
+            -- Per-document lookups come back in reading order without a sort
+            CREATE INDEX IF NOT EXISTS chunks_file_page ON chunks(file_name, page, chunk_id);
+        """)
+        self._import_legacy_chunk_store()
+
+    def _import_legacy_chunk_store(self):
+        """Move chunks from an older chunk_store.json into SQLite."""
+        if not self.chunk_store_file.exists():
+            return
+        
+        with open(self.chunk_store_file, 'rb') as f:
+            store = orjson.loads(f.read())
+        
+        self._write_chunk_rows(
+            (uid, *(record.get(col) for col in _CHUNK_COLUMNS))
+            for uid, record in store.items()
+        )
+        self.chunk_store_file.unlink()
+        print(f"[DONE] Imported {len(store)} chunks into {self.chunk_db_file}")
+
+    def _write_chunk_rows(self, rows):
+        """Insert or replace chunk rows in a single transaction."""
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO chunks (uid, text, file_name, page, chunk_id, file_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
     def _update_chunk_store(self, new_chunks: List[TextChunk]):
-        """Append new chunks to local store.
+        """Add new chunks to the local chunk store.
         
         Args:
             new_chunks: List of new text chunks
         """
-        store = self._load_chunk_store()
-        for chunk in new_chunks:
-            # We need a globally unique ID for chunks across all files
-            # Using filename + chunk_id as key
-            uid = f"{chunk.source_file}_{chunk.chunk_id}"
-            store[uid] = {
-                "text": chunk.text,
-                "file_name": chunk.source_file,
-                "page": chunk.page_num,
-                "chunk_id": chunk.chunk_id,
-                "file_path": chunk.metadata.get("file_path", "")
-            }
-            
-        with open(self.chunk_store_file, 'w') as f:
-            json.dump(store, f)
+        # Keyed by the chunk's globally unique id (filename + chunk_id)
+        self._write_chunk_rows(
+            (chunk.uid, chunk.text, chunk.source_file,
+             chunk.page_num, chunk.chunk_id, chunk.file_path)
+            for chunk in new_chunks
+        )
         print(f"[DONE] Updated chunk store with {len(new_chunks)} new chunks")
 
+    def flush(self):
+        """Checkpoint the chunk store and write pending index metadata (call on shutdown)."""
+        with self._db_lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._flush_index_metadata()
+
     def _update_index_metadata(self, new_chunks: List[TextChunk]):
-        """Update index metadata with new chunks.
+        """Record new chunks for the next index metadata flush.
         
         Args:
             new_chunks: List of new text chunks
         """
-        metadata = self.get_index_info() or {
-            "total_chunks": 0,
-            "files": {},
-            "embedding_model": self.embedder.model_name,
-            "embedding_dimension": self.embedder.get_dimension()
-        }
-        
-        metadata["total_chunks"] += len(new_chunks)
-        
-        # Update by file
-        for chunk in new_chunks:
-            filename = chunk.source_file
-            if filename not in metadata["files"]:
-                metadata["files"][filename] = {
+        with self._index_lock:
+            for chunk in new_chunks:
+                file_meta = self._index_pending.get(chunk.source_file)
+                if file_meta is None:
+                    file_meta = self._index_pending[chunk.source_file] = {
+                        "chunks": 0,
+                        "pages": set()
+                    }
+                
+                file_meta["chunks"] += 1
+                file_meta["pages"].add(chunk.page_num)
+    
+    @contextmanager
+    def _index_file_lock(self):
+        """Hold the index lock and, where supported, an exclusive lock on document_index.lock."""
+        with self._index_lock, open(self.index_file.with_suffix(".lock"), 'ab') as lock:
+            if fcntl is not None:
+                # Released when the lock file is closed
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+    
+    def _load_index_metadata(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Return the on-disk index metadata, re-read if the file changed (call under _index_lock)."""
+        try:
+            mtime = self.index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._index_meta = self._index_meta_mtime = None
+            return None
+        
+        if force or mtime != self._index_meta_mtime:
+            with open(self.index_file, 'rb') as f:
+                metadata = orjson.loads(f.read())
+            for file_meta in metadata.get("files", {}).values():
+                file_meta["pages"] = set(file_meta.get("pages", []))
+            self._index_meta = metadata
+            self._index_meta_mtime = mtime
+        return self._index_meta
+    
+    def _merge_index_metadata(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Copy of metadata (or a new index) with the pending updates applied."""
+        if metadata is None:
+            merged = {
+                "total_chunks": 0,
+                "files": {},
+                "embedding_model": self._model_name,
+                "embedding_dimension": self._dim
+            }
+        else:
+            merged = {**metadata, "files": {
+                filename: {**file_meta, "pages": set(file_meta["pages"])}
+                for filename, file_meta in metadata.get("files", {}).items()
+            }}
+        
+        for filename, pending in self._index_pending.items():
+            file_meta = merged["files"].get(filename)
+            if file_meta is None:
+                file_meta = merged["files"][filename] = {
                     "chunks": 0,
-                    "pages": [] 
+                    "pages": set()
                 }
             
-            metadata["files"][filename]["chunks"] += 1
-            if chunk.page_num not in metadata["files"][filename]["pages"]:
-                metadata["files"][filename]["pages"].append(chunk.page_num)
-                metadata["files"][filename]["pages"].sort()
+            file_meta["chunks"] += pending["chunks"]
+            file_meta["pages"] |= pending["pages"]
+            merged["total_chunks"] += pending["chunks"]
+        return merged
+    
+    def _flush_index_metadata(self, removed_file: Optional[str] = None) -> bool:
+        """Merge pending index updates into document_index.json.
         
-        # Save to file
-        with open(self.index_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        The file is re-read under a lock first, so entries other processes
+        (API workers, CLI runs) wrote in the meantime are kept.
+        
+        Args:
+            removed_file: Also drop this file's entry (document deletion)
+            
+        Returns:
+            True if removed_file had an entry
+        """
+        if not self._index_pending and removed_file is None:
+            return False
+        
+        with self._index_file_lock():
+            metadata = self._merge_index_metadata(self._load_index_metadata(force=True))
+            removed = metadata["files"].pop(removed_file, None) if removed_file else None
+            if removed is None and not self._index_pending:
+                return False
+            if removed is not None:
+                metadata["total_chunks"] = max(0, metadata["total_chunks"] - removed["chunks"])
+            
+            # Replaced atomically, so readers never see a partial file
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(metadata, default=_json_default))
+            os.replace(tmp_file, self.index_file)
+            
+            self._index_meta = metadata
+            self._index_meta_mtime = self.index_file.stat().st_mtime_ns
+            self._index_pending = {}
         
         print(f"[DONE] Updated index metadata at {self.index_file}")
+        return removed is not None
     
     def search(
         self,
@@ -278,102 +542,125 @@ class SemanticSearchEngine:
             filter_dict=filter_dict
         )
         
-        # Hydrate results from local chunk store
-        # Hydrate results from local chunk store
-        chunk_store = self._load_chunk_store()
-        hydrated_results = []
-        missing_count = 0
-        
-        for res in results:
-            res_id = res["id"]
-            if res_id in chunk_store:
-                res["metadata"] = chunk_store[res_id]
-                hydrated_results.append(res)
-            else:
-                missing_count += 1
-                # print(f"Warning: Result ID {res_id} not found in local chunk store")
+        # Hydrate results from local chunk store (only the returned uids)
+        chunk_store = self._fetch_chunks([res["id"] for res in results])
+        return self._hydrate_results(results, chunk_store)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter_by_file: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once.
+        
+        Queries are embedded in one batch, searched concurrently, and all
+        results are hydrated with a single chunk-store lookup.
         
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+            filter_by_file: Optional filename to filter results
+            
+        Returns:
+            One list of search results per query, in query order
+        """
+        if not queries:
+            return []
+        
+        query_embeddings = self.embedder.embed_batch(queries, show_progress=False)
+        
+        filter_dict = None
+        if filter_by_file:
+            filter_dict = {"file_name": filter_by_file}
+        
+        # The vector DB has no multi-query endpoint, so fan out the searches
+        with ThreadPoolExecutor(max_workers=min(len(queries), SEARCH_BATCH_WORKERS)) as pool:
+            all_results = list(pool.map(
+                lambda embedding: self.endee_client.search(
+                    query_vector=embedding,
+                    top_k=top_k,
+                    filter_dict=filter_dict
+                ),
+                query_embeddings
+            ))
+        
+        chunk_store = self._fetch_chunks([res["id"] for results in all_results for res in results])
+        return [self._hydrate_results(results, chunk_store) for results in all_results]
+
+    @staticmethod
+    def _hydrate_results(results: List[Dict[str, Any]], chunk_store: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Attach local chunk metadata to vector-DB results, dropping unknown ids."""
+        hydrated_results = [
+            {**res, "metadata": metadata}
+            for res in results
+            if (metadata := chunk_store.get(res["id"])) is not None
+        ]
+        
+        missing_count = len(results) - len(hydrated_results)
         if missing_count > 0:
             print(f"Warning: {missing_count} search results found in DB but missing locally. Index mismatch.")
             
         return hydrated_results
 
-    def _save_chunk_store(self, chunks: List[TextChunk]):
-        """Save full chunk text and metadata to local store.
+    def _fetch_chunks(self, uids: List[str]) -> Dict[str, Any]:
+        """Look up specific chunks in the local store.
         
         Args:
-            chunks: List of text chunks
-        """
-        store = {}
-        for chunk in chunks:
-            store[str(chunk.chunk_id)] = {
-                "text": chunk.text,
-                "file_name": chunk.source_file,
-                "page": chunk.page_num,
-                "chunk_id": chunk.chunk_id,
-                "file_path": chunk.metadata.get("file_path", "")
-            }
+            uids: Chunk uids to fetch (duplicates are allowed)
             
-        with open(self.chunk_store_file, 'w') as f:
-            json.dump(store, f)
-        print(f"[DONE] Saved {len(store)} chunks to {self.chunk_store_file}")
-
-    def _load_chunk_store(self) -> Dict[str, Any]:
-        """Load local chunk store.
-        
         Returns:
-            Dict of chunk_id -> metadata
+            Dict of uid -> metadata for the uids that exist
         """
-        if self.chunk_store_file.exists():
-            with open(self.chunk_store_file, 'r') as f:
-                return json.load(f)
-        return {}
+        unique_uids = list(dict.fromkeys(uids))
+        chunks = {}
+        if not unique_uids:
+            # Don't wait on the store lock (held by ingestion writes) for nothing
+            return chunks
+        with self._db_lock:
+            for start in range(0, len(unique_uids), _MAX_SQL_VARIABLES):
+                batch = unique_uids[start:start + _MAX_SQL_VARIABLES]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT uid, {', '.join(_CHUNK_COLUMNS)} FROM chunks WHERE uid IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for row in rows:
+                    chunks[row[0]] = dict(zip(_CHUNK_COLUMNS, row[1:]))
+        return chunks
     
-    def _save_index_metadata(self, chunks: List[TextChunk]):
-        """Save index metadata to file.
+    def _fetch_document_chunks(self, filename: str) -> List[Dict[str, Any]]:
+        """Look up all chunks of one document (uses the file_name index).
         
         Args:
-            chunks: List of text chunks
-        """
-        metadata = {
-            "total_chunks": len(chunks),
-            "files": {},
-            "embedding_model": self.embedder.model_name,
-            "embedding_dimension": self.embedder.get_dimension()
-        }
-        
-        # Aggregate by file
-        for chunk in chunks:
-            filename = chunk.source_file
-            if filename not in metadata["files"]:
-                metadata["files"][filename] = {
-                    "chunks": 0,
-                    "pages": set()
-                }
+            filename: Name of the PDF file
             
-            metadata["files"][filename]["chunks"] += 1
-            metadata["files"][filename]["pages"].add(chunk.page_num)
-        
-        # Convert sets to lists for JSON serialization
-        for file_data in metadata["files"].values():
-            file_data["pages"] = sorted(list(file_data["pages"]))
-        
-        # Save to file
-        with open(self.index_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        print(f"✓ Saved index metadata to {self.index_file}")
+        Returns:
+            List of chunk metadata dicts, ordered by page then chunk_id
+        """
+        with self._db_lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(_CHUNK_COLUMNS)} FROM chunks WHERE file_name = ? ORDER BY page, chunk_id",
+                (filename,)
+            ).fetchall()
+        return [dict(zip(_CHUNK_COLUMNS, row)) for row in rows]
     
     def get_index_info(self) -> Optional[Dict[str, Any]]:
         """Get information about the current index.
         
         Returns:
-            Index metadata or None
+            Index metadata or None. A fresh copy that includes chunks not yet
+            flushed to disk; each file's "pages" is a sorted list.
         """
-        if self.index_file.exists():
-            with open(self.index_file, 'r') as f:
-                return json.load(f)
-        return None
+        with self._index_lock:
+            metadata = self._load_index_metadata()
+            if metadata is None and not self._index_pending:
+                return None
+            metadata = self._merge_index_metadata(metadata)
+        
+        for file_meta in metadata["files"].values():
+            file_meta["pages"] = sorted(file_meta["pages"])
+        return metadata
     
     def get_available_documents(self) -> List[str]:
         """Get list of available documents in the index.
@@ -396,14 +683,16 @@ class SemanticSearchEngine:
         success = self.endee_client.delete_collection()
         
         if success:
-            if self.index_file.exists():
-                self.index_file.unlink()
-            if self.chunk_store_file.exists():
-                self.chunk_store_file.unlink()
+            with self._index_file_lock():
+                if self.index_file.exists():
+                    self.index_file.unlink()
+                self._index_meta = self._index_meta_mtime = None
+                self._index_pending = {}
+            with self._db_lock:
+                self._db.execute("DELETE FROM chunks")
             print("[DONE] Index reset complete")
         
         return success
-        return success
 
     def delete_document(self, filename: str) -> bool:
         """Delete a document from the system completely.
@@ -423,28 +712,15 @@ class SemanticSearchEngine:
                 print(f"Warning: Failed to delete vectors for {filename} from DB")
             
             # 2. Remove from Local Chunk Store
-            store = self._load_chunk_store()
-            # Find keys to delete
-            keys_to_delete = [k for k, v in store.items() if v.get("file_name") == filename]
-            for k in keys_to_delete:
-                del store[k]
+            with self._db_lock:
+                deleted = self._db.execute("DELETE FROM chunks WHERE file_name = ?", (filename,)).rowcount
             
-            if keys_to_delete:
-                with open(self.chunk_store_file, 'w') as f:
-                    json.dump(store, f)
-                print(f"Deleted {len(keys_to_delete)} chunks from local store")
+            if deleted:
+                print(f"Deleted {deleted} chunks from local store")
             
             # 3. Remove from Index Metadata
-            metadata = self.get_index_info()
-            if metadata and "files" in metadata:
-                if filename in metadata["files"]:
-                    chunks_count = metadata["files"][filename]["chunks"]
-                    metadata["total_chunks"] = max(0, metadata["total_chunks"] - chunks_count)
-                    del metadata["files"][filename]
-                    
-                    with open(self.index_file, 'w') as f:
-                        json.dump(metadata, f, indent=2)
-                    print(f"Removed {filename} from index metadata")
+            if self._flush_index_metadata(removed_file=filename):
+                print(f"Removed {filename} from index metadata")
             
             # 4. Delete Physical File
             pdf_path = Config.PDF_DIR / filename
@@ -1,5 +1,11 @@
 """Document summarizer using LLM to summarize documents from vector database."""
-from typing import List, Dict, Any, Optional
+import hashlib
+import orjson
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -11,13 +17,106 @@ from search_engine import SemanticSearchEngine
 # Load environment variables
 load_dotenv()
 
+# Max concurrent LLM calls in summarize_all_documents
+SUMMARY_MAX_CONCURRENCY = 8
+# Summaries kept per (filename, length, content) and how long they stay valid
+SUMMARY_CACHE_SIZE = 128
+SUMMARY_CACHE_TTL = 3600  # seconds
+# Max characters sent to the LLM in one call; longer documents are split into
+# sections that are summarized separately and then combined (map-reduce)
+SUMMARY_SECTION_CHARS = 20000
+# Completion token budget per summary length (and for each map-step section
+# summary); smaller reservations return faster
+SUMMARY_MAX_TOKENS = {"short": 150, "medium": 500, "long": 1500}
+SECTION_SUMMARY_MAX_TOKENS = 400
+
+# Parsed once at import; chains are composed per call around the bound LLM
+_SUMMARY_PROMPT = ChatPromptTemplate.from_template("""You are a helpful AI assistant that creates clear and accurate document summaries.
+
+Document: {filename}
+
+Content:
+{content}
+
+Task: {instruction}
+
+Summary:""")
+
+_SECTION_PROMPT = ChatPromptTemplate.from_template("""You are a helpful AI assistant that creates clear and accurate document summaries.
+
+Document: {filename}
+
+Section content:
+{content}
+
+Task: Summarize this section of the document in one concise paragraph, keeping its key points, findings and important details.
+
+Section summary:""")
+
+# "Page 3 of 120" style footers left in the extracted text
+_PAGE_MARKER_RE = re.compile(r"\bpage\s+\d+\s+of\s+\d+\b", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _clean_chunk_texts(texts: Iterable[str]) -> List[str]:
+    """Prepare chunk texts for the LLM prompt.
+    
+    Strips page markers, collapses whitespace runs to single spaces and skips
+    empty or repeated chunks (boilerplate pages), so fewer tokens are spent
+    on layout noise.
+    """
+    cleaned = []
+    seen = set()
+    for text in texts:
+        text = _WHITESPACE_RE.sub(" ", _PAGE_MARKER_RE.sub(" ", text)).strip()
+        if text and text not in seen:
+            seen.add(text)
+            cleaned.append(text)
+    return cleaned
+
+
+def _group_texts(texts: List[str], max_chars: int) -> List[str]:
+    """Join consecutive texts into groups of at most max_chars characters.
+    
+    A single text longer than max_chars is cut to max_chars.
+    """
+    groups = []
+    current = []
+    current_chars = 0
+    for text in texts:
+        text = text[:max_chars]
+        if current and current_chars + 2 + len(text) > max_chars:
+            groups.append("\n\n".join(current))
+            current = []
+            current_chars = 0
+        current_chars += len(text) + (2 if current else 0)
+        current.append(text)
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
 
 class DocumentSummarizer:
     """Summarize documents stored in the vector database."""
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls):
+        """Get or create the singleton instance (thread-safe)."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
     
     def __init__(self):
         """Initialize the document summarizer."""
         self.search_engine = SemanticSearchEngine.get_instance()
+        # LRU of cache key -> (expiry time, summary result)
+        self._summary_cache: "OrderedDict[tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # API requests summarize on worker threads; guards every cache access
+        self._summary_cache_lock = threading.Lock()
         
         # Initialize LLM with OpenRouter (Using correct params for newer LangChain)
         api_key = os.getenv("OPENROUTER_API_KEY")
@@ -47,36 +146,37 @@ class DocumentSummarizer:
         return list(files.keys())
     
     def get_document_chunks(self, filename: str) -> List[Dict[str, Any]]:
-        """Retrieve all chunks for a specific document."""
-        chunk_store = self.search_engine._load_chunk_store()
-        
-        document_chunks = []
-        for chunk_id, chunk_data in chunk_store.items():
-            if chunk_data.get("file_name") == filename:
-                document_chunks.append({
-                    "text": chunk_data.get("text", ""),
-                    "page": chunk_data.get("page", "?"),
-                    "chunk_id": chunk_data.get("chunk_id", "")
-                })
-        
-        document_chunks.sort(key=lambda x: x.get("page", 0))
-        return document_chunks
+        """Retrieve all chunks for a specific document, in page order."""
+        return [
+            {
+                "text": chunk_data.get("text") or "",
+                "page": chunk_data.get("page", "?"),
+                "chunk_id": chunk_data.get("chunk_id", "")
+            }
+            for chunk_data in self.search_engine._fetch_document_chunks(filename)
+        ]
     
-    def summarize_document(self, filename: str, max_length: str = "medium") -> Dict[str, Any]:
-        """Generate a summary of a document."""
-        chunks = self.get_document_chunks(filename)
+    def _prepare_summary(self, filename: str, max_length: str) -> Optional[Dict[str, Any]]:
+        """Collect a document's chunks and split its text into LLM-sized sections.
         
+        Returns:
+            Dict with "filename", "instruction", text "sections", "chunk_count",
+            "page_count" and summary "cache_key", or None if the document has no chunks
+        """
+        chunks = self.get_document_chunks(filename)
         if not chunks:
-            return {
-                "filename": filename,
-                "summary": "Document not found in the database.",
-                "chunk_count": 0,
-                "error": "Document not found"
-            }
+            return None
         
-        # Combine all chunk texts
-        full_text = "\n\n".join([chunk["text"] for chunk in chunks])
-        print(f"Summarizing {filename}: {len(chunks)} chunks, {len(full_text)} chars")
+        # Combine chunk texts into sections that each fit in one LLM call
+        # One pass for both the texts and the distinct pages
+        texts = []
+        pages = set()
+        for chunk in chunks:
+            texts.append(chunk["text"])
+            pages.add(chunk["page"])
+        texts = _clean_chunk_texts(texts)
+        sections = _group_texts(texts, SUMMARY_SECTION_CHARS) or [""]
+        print(f"Summarizing {filename}: {len(chunks)} chunks, {len(sections)} section(s)")
         
         length_instructions = {
             "short": "Provide a brief 2-3 sentence summary highlighting the main topic.",
@@ -86,42 +186,177 @@ class DocumentSummarizer:
         
         instruction = length_instructions.get(max_length, length_instructions["medium"])
         
-        prompt = ChatPromptTemplate.from_template("""You are a helpful AI assistant that creates clear and accurate document summaries.
-
-Document: {filename}
-
-Content:
-{content}
-
-Task: {instruction}
-
-Summary:""")
+        # Re-ingested documents with changed text get a new key
+        digest = hashlib.sha256()
+        for section in sections:
+            digest.update(section.encode("utf-8"))
+            digest.update(b"\0")
+        
+        return {
+            "filename": filename,
+            "instruction": instruction,
+            "sections": sections,
+            "chunk_count": len(chunks),
+            "page_count": len(pages),
+            "cache_key": (filename, max_length, digest.hexdigest())
+        }
+    
+    def _final_inputs(self, prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a document to the inputs of its final summarization call.
+        
+        Multi-section documents are map-reduced: every section is summarized
+        (concurrently) and the section summaries are regrouped, repeating
+        until they fit in a single call.
+        
+        Args:
+            prepared: Result of _prepare_summary
+            
+        Returns:
+            Inputs for the chain returned by _build_chain
+        """
+        filename = prepared["filename"]
+        sections = prepared["sections"]
+        
+        while len(sections) > 1:
+            section_summaries = self._build_map_chain().batch(
+                [{"filename": filename, "content": section} for section in sections],
+                config={"max_concurrency": SUMMARY_MAX_CONCURRENCY}
+            )
+            regrouped = _group_texts(section_summaries, SUMMARY_SECTION_CHARS)
+            if len(regrouped) >= len(sections):
+                # Summaries are not getting shorter; keep what fits
+                regrouped = regrouped[:1]
+            sections = regrouped
+        
+        return {
+            "filename": filename,
+            "content": sections[0],
+            "instruction": prepared["instruction"]
+        }
+    
+    def _get_cached_summary(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a cached summary result if present and not expired."""
+        with self._summary_cache_lock:
+            entry = self._summary_cache.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, result = entry
+            if time.time() >= expires_at:
+                del self._summary_cache[key]
+                return None
+            
+            self._summary_cache.move_to_end(key)
+        return dict(result)
+    
+    def _cache_summary(self, key: tuple, result: Dict[str, Any]):
+        """Store a successful summary result."""
+        entry = (time.time() + SUMMARY_CACHE_TTL, dict(result))
+        with self._summary_cache_lock:
+            self._summary_cache[key] = entry
+            self._summary_cache.move_to_end(key)
+            if len(self._summary_cache) > SUMMARY_CACHE_SIZE:
+                self._summary_cache.popitem(last=False)
+    
+    def _build_chain(self, max_length: str = "medium"):
+        """Build the prompt | LLM | parser summarization chain.
+        
+        Args:
+            max_length: Summary length, which sets the completion token budget
+        """
+        max_tokens = SUMMARY_MAX_TOKENS.get(max_length, SUMMARY_MAX_TOKENS["medium"])
+        return _SUMMARY_PROMPT | self.llm.bind(max_tokens=max_tokens) | StrOutputParser()
+    
+    def _build_map_chain(self):
+        """Build the chain that summarizes one section of a long document."""
+        return _SECTION_PROMPT | self.llm.bind(max_tokens=SECTION_SUMMARY_MAX_TOKENS) | StrOutputParser()
+    
+    @staticmethod
+    def _not_found_result(filename: str) -> Dict[str, Any]:
+        """Result returned for a document with no stored chunks."""
+        return {
+            "filename": filename,
+            "summary": "Document not found in the database.",
+            "chunk_count": 0,
+            "error": "Document not found"
+        }
+    
+    @staticmethod
+    def _summary_result(prepared: Dict[str, Any], summary: str) -> Dict[str, Any]:
+        """Result returned for a summarized document."""
+        return {
+            "filename": prepared["filename"],
+            "summary": summary,
+            "chunk_count": prepared["chunk_count"],
+            "page_count": prepared["page_count"]
+        }
+    
+    def summarize_document(self, filename: str, max_length: str = "medium") -> Dict[str, Any]:
+        """Generate a summary of a document."""
+        prepared = self._prepare_summary(filename, max_length)
+        if prepared is None:
+            return self._not_found_result(filename)
+        
+        cached = self._get_cached_summary(prepared["cache_key"])
+        if cached is not None:
+            return cached
         
         try:
-            chain = prompt | self.llm | StrOutputParser()
-            summary = chain.invoke({
-                "filename": filename,
-                "content": full_text[:20000],  # Increased limit slightly, typical 8k context might handle 20k chars roughly but safe is 15-20k
-                "instruction": instruction
-            })
+            summary = self._build_chain(max_length).invoke(self._final_inputs(prepared))
             
             if not summary:
-                summary = "Error: LLM returned empty response."
+                return self._summary_result(prepared, "Error: LLM returned empty response.")
                 
         except Exception as e:
             print(f"Summarization failed: {e}")
-            summary = f"Error generating summary: {str(e)}"
+            return self._summary_result(prepared, f"Error generating summary: {str(e)}")
         
-        return {
-            "filename": filename,
-            "summary": summary,
-            "chunk_count": len(chunks),
-            "page_count": len(set(chunk["page"] for chunk in chunks))
-        }
+        result = self._summary_result(prepared, summary)
+        self._cache_summary(prepared["cache_key"], result)
+        return result
+    
+    def summarize_document_stream(self, filename: str, max_length: str = "medium") -> Iterator[str]:
+        """Generate a summary of a document, yielding text as the LLM produces it.
+        
+        Args:
+            filename: Name of the document
+            max_length: Summary length ("short", "medium", "long")
+            
+        Yields:
+            Summary text fragments (error messages are yielded as text too)
+        """
+        prepared = self._prepare_summary(filename, max_length)
+        if prepared is None:
+            yield self._not_found_result(filename)["summary"]
+            return
+        
+        cached = self._get_cached_summary(prepared["cache_key"])
+        if cached is not None:
+            yield cached["summary"]
+            return
+        
+        parts = []
+        try:
+            for part in self._build_chain(max_length).stream(self._final_inputs(prepared)):
+                parts.append(part)
+                yield part
+        except Exception as e:
+            print(f"Summarization failed: {e}")
+            yield f"Error generating summary: {str(e)}"
+            return
+        
+        summary = "".join(parts)
+        if not summary:
+            yield "Error: LLM returned empty response."
+            return
+        self._cache_summary(prepared["cache_key"], self._summary_result(prepared, summary))
     
     def summarize_all_documents(self, max_length: str = "short") -> List[Dict[str, Any]]:
         """Generate summaries for all documents in the database.
         
+        Documents are summarized concurrently (up to SUMMARY_MAX_CONCURRENCY
+        LLM calls in flight); long documents are map-reduced first.
+        
         Args:
             max_length: Summary length for each document
             
@@ -129,13 +364,154 @@ Summary:""")
             List of summaries for all documents
         """
         documents = self.get_available_documents()
-        summaries = []
+        prepared = {doc: self._prepare_summary(doc, max_length) for doc in documents}
+        cached = {
+            doc: self._get_cached_summary(prepared[doc]["cache_key"])
+            for doc in documents
+            if prepared[doc] is not None
+        }
+        found = [doc for doc in documents if prepared[doc] is not None and cached[doc] is None]
         
+        summaries_by_doc = {}
+        final_inputs = {}
+        for doc in found:
+            try:
+                final_inputs[doc] = self._final_inputs(prepared[doc])
+            except Exception as e:
+                summaries_by_doc[doc] = e
+        
+        if final_inputs:
+            outputs = self._build_chain(max_length).batch(
+                list(final_inputs.values()),
+                config={"max_concurrency": SUMMARY_MAX_CONCURRENCY},
+                return_exceptions=True
+            )
+            summaries_by_doc.update(zip(final_inputs, outputs))
+        
+        summaries = []
         for doc in documents:
-            summary = self.summarize_document(doc, max_length)
-            summaries.append(summary)
+            if prepared[doc] is None:
+                summaries.append(self._not_found_result(doc))
+                continue
+            if cached[doc] is not None:
+                summaries.append(cached[doc])
+                continue
+            
+            summary = summaries_by_doc[doc]
+            if isinstance(summary, Exception):
+                print(f"Summarization failed for {doc}: {summary}")
+                summaries.append(self._summary_result(prepared[doc], f"Error generating summary: {str(summary)}"))
+            elif not summary:
+                summaries.append(self._summary_result(prepared[doc], "Error: LLM returned empty response."))
+            else:
+                result = self._summary_result(prepared[doc], summary)
+                self._cache_summary(prepared[doc]["cache_key"], result)
+                summaries.append(result)
         
         return summaries
+    
+    def summarize_all_documents_batch(
+        self,
+        max_length: str = "short",
+        poll_interval: float = 60.0
+    ) -> List[Dict[str, Any]]:
+        """Summarize all documents through the provider's Batch API.
+        
+        Batch requests cost about half as much and are not rate limited like
+        live calls, but can take up to 24 hours; meant for offline runs over
+        large corpora. Needs a base URL that implements the OpenAI Batch API
+        (e.g. https://api.openai.com/v1; OpenRouter does not). Long documents
+        are map-reduced with live calls first, only final summaries are batched.
+        
+        Args:
+            max_length: Summary length for each document
+            poll_interval: Seconds between batch status checks
+            
+        Returns:
+            List of summaries for all documents
+        """
+        from openai import OpenAI
+        
+        documents = self.get_available_documents()
+        prepared = {doc: self._prepare_summary(doc, max_length) for doc in documents}
+        results = {}
+        
+        chain = self._build_chain(max_length)
+        requests_by_id = {}
+        lines = []
+        for i, doc in enumerate(documents):
+            if prepared[doc] is None:
+                results[doc] = self._not_found_result(doc)
+                continue
+            cached = self._get_cached_summary(prepared[doc]["cache_key"])
+            if cached is not None:
+                results[doc] = cached
+                continue
+            
+            try:
+                messages = chain.first.invoke(self._final_inputs(prepared[doc])).to_messages()
+            except Exception as e:
+                print(f"Summarization failed for {doc}: {e}")
+                results[doc] = self._summary_result(prepared[doc], f"Error generating summary: {str(e)}")
+                continue
+            
+            custom_id = str(i)
+            requests_by_id[custom_id] = doc
+            lines.append(orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.llm.model_name,
+                    "messages": [{"role": "user", "content": message.content} for message in messages],
+                    "max_tokens": SUMMARY_MAX_TOKENS.get(max_length, SUMMARY_MAX_TOKENS["medium"])
+                }
+            }))
+        
+        if lines:
+            outputs = {}
+            try:
+                client = OpenAI(
+                    api_key=self.llm.openai_api_key.get_secret_value() if self.llm.openai_api_key else None,
+                    base_url=self.llm.openai_api_base,
+                    default_headers=self.llm.default_headers
+                )
+                batch_input = client.files.create(file=("summaries.jsonl", b"\n".join(lines)), purpose="batch")
+                batch = client.batches.create(
+                    input_file_id=batch_input.id,
+                    endpoint="/v1/chat/completions",
+                    completion_window="24h"
+                )
+                print(f"Submitted summary batch {batch.id} ({len(lines)} documents)")
+                
+                while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                    time.sleep(poll_interval)
+                    batch = client.batches.retrieve(batch.id)
+                
+                if batch.status != "completed" or not batch.output_file_id:
+                    raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+                
+                for line in client.files.content(batch.output_file_id).text.splitlines():
+                    if not line.strip():
+                        continue
+                    record = orjson.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") == 200:
+                        outputs[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            except Exception as e:
+                print(f"Batch summarization failed: {e}")
+                for doc in requests_by_id.values():
+                    results[doc] = self._summary_result(prepared[doc], f"Error generating summary: {str(e)}")
+            else:
+                for custom_id, doc in requests_by_id.items():
+                    summary = outputs.get(custom_id)
+                    if not summary:
+                        results[doc] = self._summary_result(prepared[doc], "Error: LLM returned empty response.")
+                        continue
+                    results[doc] = self._summary_result(prepared[doc], summary)
+                    self._cache_summary(prepared[doc]["cache_key"], results[doc])
+        
+        return [results[doc] for doc in documents]
 
 
 # Convenience function
@@ -149,7 +525,4 @@ def summarize(filename: str, length: str = "medium") -> str:
     Returns:
         Summary text
     """
-    # Note: This creates a new summarizer which uses the singleton search engine
-    summarizer = DocumentSummarizer()
-    result = summarizer.summarize_document(filename, length)
-    return result["summary"]
+    return DocumentSummarizer.get_instance().summarize_document(filename, length)["summary"]
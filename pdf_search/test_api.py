@@ -1,9 +1,15 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 try:
     print("Testing /api/search...")
-    response = requests.post(
+    response = SESSION.post(
         "http://localhost:8000/api/search",
         json={"query": "agentic ai", "top_k": 3}
     )
@@ -1,5 +1,6 @@
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import sys
 from pathlib import Path
@@ -7,10 +8,15 @@ from pathlib import Path
 BASE_URL = "http://localhost:8000"
 PDF_PATH = Path("pdfs/test_doc.pdf")
 
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 def test_workflow():
     print(f"Checking health at {BASE_URL}/api/health ...")
     try:
-        r = requests.get(f"{BASE_URL}/api/health", timeout=5)
+        r = SESSION.get(f"{BASE_URL}/api/health", timeout=5)
         print(f"Health: {r.status_code} {r.json()}")
     except Exception as e:
         print(f"Server not up: {e}")
@@ -19,7 +25,7 @@ def test_workflow():
     print(f"Uploading {PDF_PATH}...")
     with open(PDF_PATH, "rb") as f:
         files = {"files": (PDF_PATH.name, f, "application/pdf")}
-        r = requests.post(f"{BASE_URL}/api/upload", files=files)
+        r = SESSION.post(f"{BASE_URL}/api/upload", files=files)
         print(f"Upload Status: {r.status_code}")
         print(f"Upload Response: {r.json()}")
 
@@ -27,7 +33,7 @@ def test_workflow():
     time.sleep(10)
 
     print("Fetching documents...")
-    r = requests.get(f"{BASE_URL}/api/documents")
+    r = SESSION.get(f"{BASE_URL}/api/documents")
     print(f"Documents Status: {r.status_code}")
     doc_resp = r.json()
     print(f"Documents Response: {doc_resp}")
@@ -1,63 +1,75 @@
 
-import requests
-import time
+import asyncio
+import glob
+import json
 import os
+import sys
+
+import httpx
 
 BASE_URL = "http://localhost:8000"
 PDF_FILE = "pdfs/test_doc.pdf"
 
-def main():
-    # 1. Create a dummy PDF if strictly needed, or use existing
-    if not os.path.exists(PDF_FILE):
-        print(f"File {PDF_FILE} not found. using first available pdf in directory or failing")
-        # List pdfs
-        import glob
-        pdfs = glob.glob("pdfs/*.pdf")
-        if not pdfs:
-            print("No PDFs found to upload.")
-            return
-        upload_file = pdfs[0]
-    else:
-        upload_file = PDF_FILE
-
-    print(f"Uploading {upload_file}...")
+def pick_files():
+    # 1. PDFs given on the command line, else the test PDF, else the first available one
+    if len(sys.argv) > 1:
+        return sys.argv[1:]
+    if os.path.exists(PDF_FILE):
+        return [PDF_FILE]
     
-    with open(upload_file, 'rb') as f:
-        files = {'files': (os.path.basename(upload_file), f, 'application/pdf')}
-        res = requests.post(f"{BASE_URL}/api/upload", files=files)
-    
-    if res.status_code != 200:
-        print(f"Upload failed: {res.text}")
+    print(f"File {PDF_FILE} not found. using first available pdf in directory or failing")
+    pdfs = glob.glob("pdfs/*.pdf")
+    if not pdfs:
+        print("No PDFs found to upload.")
+        return []
+    return pdfs[:1]
+
+async def main():
+    upload_files = pick_files()
+    if not upload_files:
         return
-        
-    print("Upload initiated. Response:", res.json())
-    filenames = res.json().get("filenames", [])
     
-    # 2. Poll Status
-    print("Polling status...")
-    for _ in range(10): # Poll for 10 seconds
-        res = requests.get(f"{BASE_URL}/api/ingestion/status")
-        data = res.json()
-        print("Status:", data)
+    # read timeout above the server's keep-alive interval on the status stream
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=httpx.Timeout(60, connect=5)) as client:
+        print(f"Uploading {', '.join(upload_files)}...")
         
-        # Check if completed
-        all_completed = True
-        status_map = data.get("status", {})
-        for name in filenames:
-            s = status_map.get(name)
-            if s:
-                print(f"  {name}: {s.get('status')} - {s.get('progress')}/{s.get('total')}")
-                if s.get('status') != 'completed' and s.get('status') != 'failed':
-                    all_completed = False
-            else:
-                print(f"  {name}: Not found in status yet")
-                all_completed = False
-                
-        if all_completed and len(filenames) > 0:
-            print("Ingestion Completed!")
-            break
+        # All files go in one multipart request; the server ingests them in order
+        handles = [open(path, 'rb') for path in upload_files]
+        try:
+            files = [
+                ('files', (os.path.basename(path), f, 'application/pdf'))
+                for path, f in zip(upload_files, handles)
+            ]
+            res = await client.post("/api/upload", files=files)
+        finally:
+            for f in handles:
+                f.close()
+        
+        if res.status_code != 200:
+            print(f"Upload failed: {res.text}")
+            return
             
-        time.sleep(1)
+        print("Upload initiated. Response:", res.json())
+        filenames = res.json().get("filenames", [])
+        
+        # 2. Follow Status (server pushes every change; ends when all files are done)
+        print("Streaming status...")
+        async with client.stream("GET", "/api/ingestion/stream", params={"filenames": filenames}) as res:
+            async for line in res.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[len("data: "):])
+                print("Status:", data)
+                
+                status_map = data.get("status", {})
+                for name in filenames:
+                    s = status_map.get(name)
+                    if s:
+                        print(f"  {name}: {s.get('status')} - {s.get('progress')}/{s.get('total')}")
+                    else:
+                        print(f"  {name}: Not found in status yet")
+    
+    print("Ingestion Completed!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,20 +1,26 @@
 import os
+import threading
+import time
 from config import Config
 import requests
 from embedder import Embedder
 
+# Seconds to wait for all probes (the first embedder load may download the model)
+PROBE_TIMEOUT = 120
+
 # Force config load
 print(f"Testing Full Chain...")
 print(f"DB URL: {Config.ENDEE_URL}")
 print(f"API Key Present: {bool(Config.OPENROUTER_API_KEY)}")
 
-def test_chain():
+def test_db():
     # 1. Test DB Connection
     print("\n[1] Testing DB Connection...")
     try:
         resp = requests.get(f"{Config.ENDEE_URL}/api/v1/index/list", timeout=30)
         if resp.status_code == 200:
             print("✓ DB Connected")
+            return True
         else:
             print(f"✗ DB Failed: {resp.status_code}")
             return False
@@ -22,6 +28,7 @@ def test_chain():
         print(f"✗ DB Exception: {e}")
         return False
 
+def test_embed_and_search():
     # 2. Test Embedding (FastEmbed)
     print("\n[2] Testing Embedding...")
     try:
@@ -39,10 +46,12 @@ def test_chain():
     try:
         results = client.search(vector, top_k=1)
         print(f"✓ Search completed. Found {len(results)} results.")
+        return True
     except Exception as e:
         print(f"✗ Search Failed: {e}")
         return False
 
+def test_llm():
     # 4. Test LLM (OpenRouter)
     print("\n[4] Testing LLM (OpenRouter)...")
     from langchain_openai import ChatOpenAI
@@ -54,9 +63,38 @@ def test_chain():
         )
         msg = llm.invoke("Hello, are you working?")
         print(f"✓ LLM Response: {msg.content}")
+        return True
     except Exception as e:
         print(f"✗ LLM Failed: {e}")
         return False
+
+def test_chain():
+    # The probes are independent, so run them concurrently. Daemon threads,
+    # so a hung probe cannot keep the process alive past the timeout.
+    probes = [test_db, test_embed_and_search, test_llm]
+    results = {}
+    
+    def run(probe):
+        try:
+            results[probe.__name__] = probe()
+        except Exception as e:
+            print(f"✗ {probe.__name__} raised: {e!r}")
+            results[probe.__name__] = False
+    
+    threads = {probe.__name__: threading.Thread(target=run, args=(probe,), daemon=True) for probe in probes}
+    for thread in threads.values():
+        thread.start()
+    
+    deadline = time.monotonic() + PROBE_TIMEOUT
+    passed = True
+    for name, thread in threads.items():
+        thread.join(max(0, deadline - time.monotonic()))
+        if name not in results:
+            print(f"✗ {name} did not finish within {PROBE_TIMEOUT}s")
+        passed = passed and results.get(name, False)
+    
+    if not passed:
+        return False
         
     print("\n[SUCCESS] Full Chain Verified!")
     return True
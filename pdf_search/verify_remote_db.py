@@ -1,14 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 
 URL = "https://endee-1.onrender.com"
 
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 def check_connection():
     print(f"Testing connection to {URL}...")
     try:
         # Try health/list endpoint
         # EndeeClient uses /api/v1/index/list
-        resp = requests.get(f"{URL}/api/v1/index/list", timeout=10)
+        resp = SESSION.get(f"{URL}/api/v1/index/list", timeout=10)
         print(f"Status Code: {resp.status_code}")
         print(f"Response: {resp.text[:500]}")
         
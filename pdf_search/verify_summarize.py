@@ -1,15 +1,21 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 
 BASE_URL = "http://localhost:8000"
 FILENAME = "Machine-learning- Stephen Marshland.pdf"
 
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 def test_summarize():
     print(f"Requesting summary for {FILENAME}...")
     start = time.time()
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/summarize", 
             json={"filename": FILENAME, "length": "short"},
             timeout=120
@@ -34,5 +40,39 @@ def test_summarize():
     except Exception as e:
         print(f"❌ Exception: {e}")
 
+def test_summarize_stream():
+    print(f"Streaming summary for {FILENAME}...")
+    start = time.time()
+    try:
+        with SESSION.post(
+            f"{BASE_URL}/api/summarize/stream",
+            json={"filename": FILENAME, "length": "short"},
+            stream=True,
+            timeout=120
+        ) as response:
+            if response.status_code != 200:
+                print(f"❌ Failed: {response.text}")
+                return
+            
+            first_token = None
+            parts = []
+            for part in response.iter_content(chunk_size=None, decode_unicode=True):
+                if first_token is None:
+                    first_token = time.time() - start
+                parts.append(part)
+        
+        summary = "".join(parts)
+        print(f"First token after {first_token or 0:.1f}s, complete after {time.time() - start:.1f}s")
+        print(f"Summary length: {len(summary)} chars")
+        
+        if summary and "Error" not in summary:
+            print("✓ Streaming summarization passed!")
+        else:
+            print("❌ Streaming summarization returned error message.")
+            
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+
 if __name__ == "__main__":
     test_summarize()
+    test_summarize_stream()